@@ -27,7 +27,12 @@ from fastapi import (
     Body,
 )
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse, PlainTextResponse, FileResponse
+from fastapi.responses import (
+    JSONResponse,
+    ORJSONResponse,
+    PlainTextResponse,
+    FileResponse,
+)
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_pagination import add_pagination, pagination_ctx
 from fastapi_versioning import VersionedFastAPI
@@ -76,8 +81,25 @@ async def lifespan(app: FastAPI):  # pylint: disable=redefined-outer-name
 # models etc.
 API_VERSIONS = ['v0']
 
+
+class DefaultJSONResponse(ORJSONResponse):
+    """Default API response class rendering JSON with orjson
+
+    orjson only supports integers up to 64 bits, so fall back to the
+    standard JSON encoder for content it can't serialize such as large
+    integers in free-form node data.
+    """
+
+    def render(self, content) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            return JSONResponse.render(self, content)
+
+
 metrics = Metrics()
-app = FastAPI(lifespan=lifespan, debug=True)
+app = FastAPI(lifespan=lifespan, debug=True,
+              default_response_class=DefaultJSONResponse)
 db = Database(service=(os.getenv('MONGO_SERVICE') or 'mongodb://db:27017'))
 auth = Authentication(token_url="user/login")
 pubsub = None  # pylint: disable=invalid-name
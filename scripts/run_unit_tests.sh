@@ -9,5 +9,5 @@
 
 docker-compose -f test-docker-compose.yaml build --no-cache
 docker-compose -f test-docker-compose.yaml up -d api db redis storage ssh test
-docker-compose -f test-docker-compose.yaml exec -T test pytest -vs tests/unit_tests
+docker-compose -f test-docker-compose.yaml exec -T test pytest -vs -n auto --dist=loadgroup tests/unit_tests
 docker-compose -f test-docker-compose.yaml down
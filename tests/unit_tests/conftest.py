@@ -6,24 +6,28 @@
 # Copyright (C) 2022, 2023 Collabora Limited
 # Author: Jeny Sadadia <jeny.sadadia@collabora.com>
 
-# pylint: disable=protected-access
+# pylint: disable=protected-access,redefined-outer-name
 
 """pytest fixtures for KernelCI API"""
 
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, patch
 import fakeredis.aioredis
 from fastapi.testclient import TestClient
 from fastapi import Request, HTTPException, status
 import pytest
 from mongomock_motor import AsyncMongoMockClient
-from beanie import init_beanie
-from httpx import AsyncClient
+from beanie import init_beanie, PydanticObjectId
+from httpx import AsyncClient, ASGITransport
+from fastapi_users.password import PasswordHelper
+from kernelci.api.models import Node, Revision
 
 from api.main import (
     app,
     versioned_app,
     get_current_user,
     get_current_superuser,
+    user_manager,
 )
 from api.models import User, Subscription
 from api.pubsub import PubSub
@@ -32,14 +36,41 @@ BEARER_TOKEN = "Bearer \
 eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJzdWIiOiJib2IifQ.\
 ci1smeJeuX779PptTkuaG1SEdkp5M1S1AgYvX8VdB20"
 
+AUTH_HEADERS = {"Authorization": BEARER_TOKEN}
+JSON_AUTH_HEADERS = {"Content-Type": "application/json", **AUTH_HEADERS}
+
 ADMIN_BEARER_TOKEN = 'Bearer \
 eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.\
 eyJzdWIiOiJib2IiLCJzY29wZXMiOlsiYWRtaW4iXX0.\
 t3bAE-pHSzZaSHp7FMlImqgYvL6f_0xDUD-nQwxEm3k'
 
+ADMIN_HEADERS = {"Authorization": ADMIN_BEARER_TOKEN}
+JSON_ADMIN_HEADERS = {"Content-Type": "application/json", **ADMIN_HEADERS}
+
 API_VERSION = 'latest'
 BASE_URL = f'http://testserver/{API_VERSION}/'
 
+# Test users are built without validation as Beanie documents can't be
+# instantiated before Beanie is initialized, which is done for each test.
+# Use copies of them when they may be modified.
+USER_BOB = User.model_construct(
+    id=PydanticObjectId('65265305c74695807499037f'),
+    username='bob',
+    hashed_password='hello',
+    email='bob@kernelci.org',
+    groups=[],
+    is_active=True,
+    is_superuser=False,
+    is_verified=True
+)
+
+USER_ADMIN = USER_BOB.model_copy(update={
+    'id': PydanticObjectId('653a5e1a7e9312c86f8f86e1'),
+    'username': 'admin',
+    'email': 'admin@kernelci.org',
+    'is_superuser': True,
+}, deep=True)
+
 
 def mock_get_current_user(request: Request):
     """
@@ -51,16 +82,7 @@ def mock_get_current_user(request: Request):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing token",
         )
-    return User(
-        id='65265305c74695807499037f',
-        username='bob',
-        hashed_password='$2b$12$CpJZx5ooxM11bCFXT76/z.o6HWs2sPJy4iP8.'
-                        'xCZGmM8jWXUXJZ4L',
-        email='bob@kernelci.org',
-        is_active=True,
-        is_superuser=False,
-        is_verified=True
-    )
+    return USER_BOB.model_copy(deep=True)
 
 
 def mock_get_current_admin_user(request: Request):
@@ -78,23 +100,26 @@ def mock_get_current_admin_user(request: Request):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Forbidden",
         )
-    return User(
-        id='653a5e1a7e9312c86f8f86e1',
-        username='admin',
-        hashed_password='$2b$12$CpJZx5ooxM11bCFXT76/z.o6HWs2sPJy4iP8.'
-                        'xCZGmM8jWXUXJZ4K',
-        email='admin@kernelci.org',
-        groups=[],
-        is_active=True,
-        is_superuser=True,
-        is_verified=True
-    )
+    return USER_ADMIN.model_copy(deep=True)
 
 # Mock dependency callables for getting current user
 app.dependency_overrides[get_current_user] = mock_get_current_user
 app.dependency_overrides[get_current_superuser] = mock_get_current_admin_user
 
 
+@pytest.fixture(scope='session')
+def event_loop():
+    """Get an event loop shared by all the async tests
+
+    Fixtures with a wider scope such as the async test client and the PubSub
+    instance keep connections bound to the event loop they were created with,
+    so it has to outlive the tests.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
 @pytest.fixture(scope='session')
 def test_client():
     """Fixture to get FastAPI Test client instance"""
@@ -102,15 +127,89 @@ def test_client():
         yield client
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 async def test_async_client():
-    """Fixture to get Test client for asynchronous tests"""
-    async with AsyncClient(app=versioned_app, base_url=BASE_URL) as client:
-        await versioned_app.router.startup()
+    """Fixture to get Test client for asynchronous tests
+
+    The client is shared by all the tests so the app startup handlers only
+    run once, with the Pub/Sub subscription id and Beanie initialisation
+    mocked.  Beanie is then initialized for each test by `mock_init_beanie`.
+    """
+    async with AsyncClient(transport=ASGITransport(app=versioned_app),
+                           base_url=BASE_URL) as client:
+        with patch('api.pubsub.PubSub._init_sub_id', AsyncMock()), \
+                patch('api.db.Database.initialize_beanie', AsyncMock()):
+            await versioned_app.router.startup()
         yield client
         await versioned_app.router.shutdown()
 
 
+class PlainPasswordHelper(PasswordHelper):
+    """Password helper storing passwords in plain text
+
+    Unit tests check the API handlers and not the password hashing, so the
+    hashed password of a test user is the password itself.
+    """
+
+    def verify_and_update(self, plain_password, hashed_password):
+        return plain_password == hashed_password, None
+
+    def hash(self, password):
+        return password
+
+
+@pytest.fixture(scope='session', autouse=True)
+def mock_password_helper():
+    """Mocks the fastapi-users password helper to skip password hashing
+
+    This applies to the user managers created for each request as well as
+    the one used by the user registration handler.
+    """
+    helper = PlainPasswordHelper()
+    with patch('fastapi_users.manager.PasswordHelper', return_value=helper), \
+            patch.object(user_manager, 'password_helper', helper):
+        yield helper
+
+
+@pytest.fixture(scope='session')
+def sample_revision():
+    """Fixture to get a kernel revision object shared by all the tests"""
+    return Revision.model_construct(
+        tree="mainline",
+        url="https://git.kernel.org/pub/scm/linux/kernel/git/"
+            "torvalds/linux.git",
+        branch="master",
+        commit="2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
+        describe="v5.16-rc4-31-g2a987e65025e",
+    )
+
+
+@pytest.fixture(scope='session')
+def sample_node_factory(sample_revision):
+    """Fixture to get a factory function for checkout node objects
+
+    The node object is built without validation as it is only used as a
+    database mock return value, the factory returns a copy of it with the
+    fields passed as keyword arguments updated.
+    """
+    node = Node.model_construct(
+        id=PydanticObjectId("61bda8f2eb1a63d2b7152418"),
+        kind="checkout",
+        name="checkout",
+        path=["checkout"],
+        data={'kernel_revision': sample_revision},
+        parent=None,
+        state="closing",
+        result=None,
+        treeid="61bda8f2eb1a63d2b7152418",
+    )
+
+    def _make_node(**update):
+        return node.model_copy(update=update)
+
+    return _make_node
+
+
 @pytest.fixture
 def mock_db_create(mocker):
     """Mocks async call to Database class method used to create object"""
@@ -162,15 +261,6 @@ def mock_db_find_one(mocker):
     return async_mock
 
 
-@pytest.fixture(autouse=True)
-def mock_init_sub_id(mocker):
-    """Mocks async call to PubSub method to initialize subscription id"""
-    async_mock = AsyncMock()
-    mocker.patch('api.pubsub.PubSub._init_sub_id',
-                 side_effect=async_mock)
-    return async_mock
-
-
 @pytest.fixture
 def mock_listen(mocker):
     """Mocks async call to listen method of PubSub"""
@@ -192,39 +282,52 @@ def mock_publish_cloudevent(mocker):
     return async_mock
 
 
-@pytest.fixture
-def mock_pubsub(mocker):
-    """Mocks `_redis` member of PubSub class instance"""
+@pytest.fixture(scope='module')
+def pubsub_instance():
+    """Fixture to get a PubSub instance shared by the tests of a module
+
+    The `_redis` member is replaced with an in-memory fake Redis client and
+    the keep-alive timer is disabled so no task outlives a test.  Use the
+    function-scoped fixtures below to get the instance with its state reset
+    for each test.
+    """
     pubsub = PubSub()
-    redis_mock = fakeredis.aioredis.FakeRedis()
-    mocker.patch.object(pubsub, '_redis', redis_mock)
+    pubsub._redis = fakeredis.aioredis.FakeRedis()
+    pubsub._settings.keep_alive_period = 0
     return pubsub
 
 
 @pytest.fixture
-def mock_pubsub_subscriptions(mocker):
+async def mock_pubsub(pubsub_instance):
+    """Mocks `_redis` member of PubSub class instance
+
+    The subscriptions are cleared and the subscription id is reset so the
+    first subscription gets id 1.
+    """
+    pubsub_instance._subscriptions = {}
+    pubsub_instance._channels = set()
+    await pubsub_instance._redis.set(pubsub_instance.ID_KEY, 0)
+    return pubsub_instance
+
+
+@pytest.fixture
+def mock_pubsub_subscriptions(mock_pubsub):
     """Mocks `_redis` and `_subscriptions` member of PubSub class instance"""
-    pubsub = PubSub()
-    redis_mock = fakeredis.aioredis.FakeRedis()
     sub = Subscription(id=1, channel='test', user='test')
-    mocker.patch.object(pubsub, '_redis', redis_mock)
-    subscriptions_mock = dict(
-        {1: {'sub': sub, 'redis_sub': pubsub._redis.pubsub()}})
-    mocker.patch.object(pubsub, '_subscriptions', subscriptions_mock)
-    return pubsub
+    mock_pubsub._subscriptions = {
+        1: {'sub': sub, 'redis_sub': mock_pubsub._redis.pubsub()}}
+    return mock_pubsub
 
 
 @pytest.fixture()
-def mock_pubsub_publish(mocker):
+def mock_pubsub_publish(mocker, mock_pubsub):
     """
     Mocks execution of publish_cloudevent
     from PubSub class.
     """
-    pubsub = PubSub()
-    redis_mock = fakeredis.aioredis.FakeRedis()
-    mocker.patch.object(pubsub, '_redis', redis_mock)
-    mocker.patch.object(pubsub._redis, 'execute_command')
-    return pubsub
+    mocker.patch.object(mock_pubsub._redis, 'execute_command',
+                        new=AsyncMock(return_value=1))
+    return mock_pubsub
 
 
 @pytest.fixture
@@ -247,7 +350,13 @@ def mock_unsubscribe(mocker):
 
 @pytest.fixture(autouse=True)
 async def mock_init_beanie(mocker):
-    """Mocks async call to Database method to initialize Beanie"""
+    """Mocks async call to Database method to initialize Beanie
+
+    Beanie is initialized for every test with a new in-memory database so
+    that users registered by a test are not seen by the next one.  This also
+    binds the `User` model back to the mock database after the test clients
+    have run the real startup handlers.
+    """
     async_mock = AsyncMock()
     client = AsyncMongoMockClient()
     init = await init_beanie(
@@ -269,7 +378,7 @@ def mock_db_update(mocker):
 
 
 @pytest.fixture
-async def mock_beanie_get_user_by_id(mocker):
+def mock_beanie_get_user_by_id(mocker):
     """Mocks async call to external method to get model by id"""
     async_mock = AsyncMock()
     mocker.patch('fastapi_users_db_beanie.BeanieUserDatabase.get',
@@ -278,7 +387,7 @@ async def mock_beanie_get_user_by_id(mocker):
 
 
 @pytest.fixture
-async def mock_beanie_user_update(mocker):
+def mock_beanie_user_update(mocker):
     """Mocks async call to external method to update user"""
     async_mock = AsyncMock()
     mocker.patch('fastapi_users_db_beanie.BeanieUserDatabase.update',
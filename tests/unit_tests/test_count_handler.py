@@ -17,7 +17,6 @@ def test_count_nodes(mock_db_count, test_client):
     """
     mock_db_count.return_value = 10
     response = test_client.get("count")
-    print("response.json()", response.json())
     assert response.status_code == 200
     assert response.json() >= 0
 
@@ -31,6 +30,5 @@ def test_count_nodes_matching_attributes(mock_db_count, test_client):
     """
     mock_db_count.return_value = 1
     response = test_client.get("count?name=checkout")
-    print("response.json()", response.json())
     assert response.status_code == 200
     assert response.json() == 1
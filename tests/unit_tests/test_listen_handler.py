@@ -10,7 +10,7 @@
 
 """Unit test functions for KernelCI API listen handler"""
 
-from tests.unit_tests.conftest import BEARER_TOKEN
+from tests.unit_tests.conftest import AUTH_HEADERS
 
 
 def test_listen_endpoint(mock_listen, test_client):
@@ -25,9 +25,7 @@ def test_listen_endpoint(mock_listen, test_client):
 
     response = test_client.get(
         "listen/1",
-        headers={
-            "Authorization": BEARER_TOKEN
-        },
+        headers=AUTH_HEADERS,
     )
     assert response.status_code == 200
 
@@ -43,12 +41,10 @@ def test_listen_endpoint_not_found(test_client):
     """
     response = test_client.get(
         "listen/1",
-        headers={
-            "Authorization": BEARER_TOKEN
-        },
+        headers=AUTH_HEADERS,
     )
     assert response.status_code == 404
-    assert 'detail' in response.json()
+    assert b'"detail"' in response.content
 
 
 def test_listen_endpoint_without_token(test_client):
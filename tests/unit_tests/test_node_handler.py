@@ -10,190 +10,171 @@
 
 """Unit test functions for KernelCI API node handler"""
 
-import json
+import orjson
+import pytest
 
-from tests.unit_tests.conftest import BEARER_TOKEN
-from kernelci.api.models import Node, Revision
+from tests.unit_tests.conftest import JSON_AUTH_HEADERS
 from api.models import PageModel
 
 
-def test_create_node_endpoint(mock_db_create, mock_publish_cloudevent,
-                              test_client):
-    """
-    Test Case : Test KernelCI API /node endpoint
-    Expected Result :
-        HTTP Response Code 200 OK
-        JSON with created Node object attributes
-    """
-    revision_data = {
-        "tree": "mainline",
-        "url": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
-        "branch": "master",
-        "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
-        "describe": "v5.16-rc4-31-g2a987e65025e",
-    }
+EXPECTED_NODE_KEYS = frozenset({
+    'id',
+    'artifacts',
+    'created',
+    'data',
+    'debug',
+    'group',
+    'jobfilter',
+    'platform_filter',
+    'holdoff',
+    'kind',
+    'name',
+    'owner',
+    'path',
+    'parent',
+    'result',
+    'submitter',
+    'state',
+    'timeout',
+    'treeid',
+    'updated',
+    'user_groups',
+})
 
-    revision_obj = Revision.model_validate(revision_data)
-    node_obj = Node(
-        id="61bda8f2eb1a63d2b7152418",
-        kind="checkout",
-        name="checkout",
-        path=["checkout"],
-        group="debug",
-        data= {'kernel_revision': revision_obj},
-        parent=None,
-        state="closing",
-        result=None,
-        treeid="61bda8f2eb1a63d2b7152418",
-    )
-    mock_db_create.return_value = node_obj
 
-    request_dict = {
+MAINLINE_REVISION = {
+    "tree": "mainline",
+    "url": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
+    "branch": "master",
+    "describe": "v5.16-rc4-31-g2a987e65025e",
+}
+
+
+NODE_TEMPLATE = {
+    "kind": "checkout",
+    "state": "closing",
+    "result": None,
+}
+
+
+ALL_NODES = (
+    {
+        **NODE_TEMPLATE,
+        "id": "61bda8f2eb1a63d2b7152418",
         "name": "checkout",
-        "kind": "checkout",
         "path": ["checkout"],
-        "data": {"kernel_revision": revision_data},
+        "data": {
+            "kernel_revision": {
+                **MAINLINE_REVISION,
+                "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
+                "version": None,
+            },
+        },
+        "parent": None,
         "treeid": "61bda8f2eb1a63d2b7152418",
-    }
-    response = test_client.post(
-        "node",
-        headers={
-            "Accept": "application/json",
-            "Authorization": BEARER_TOKEN
+    },
+    {
+        **NODE_TEMPLATE,
+        "id": "61bda8f2eb1a63d2b7152414",
+        "name": "test_node",
+        "path": ["checkout", "test_suite", "test_node"],
+        "group": None,
+        "data": {
+            "kernel_revision": {
+                **MAINLINE_REVISION,
+                "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb45",
+                "version": None,
+            },
         },
-        data=json.dumps(request_dict)
-        )
-    print("response.json()", response.json())
-    assert response.status_code == 200
-    assert response.json().keys() == {
-        'id',
-        'artifacts',
-        'created',
-        'data',
-        'debug',
-        'group',
-        'jobfilter',
-        'platform_filter',
-        'holdoff',
-        'kind',
-        'name',
-        'owner',
-        'path',
-        'parent',
-        'result',
-        'submitter',
-        'state',
-        'timeout',
-        'treeid',
-        'updated',
-        'user_groups',
-    }
+        "parent": None,
+        "treeid": "61bda8f2eb1a63d2b7152418",
+    },
+    {
+        **NODE_TEMPLATE,
+        "id": "61bda8f2eb1a63d2b7152421",
+        "name": "test",
+        "path": ["checkout", "group", "test"],
+        "group": None,
+        "data": {
+            "kernel_revision": {
+                **MAINLINE_REVISION,
+                "tree": "baseline",
+                "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
+                "version": None,
+            },
+        },
+        "parent": None,
+        "treeid": "61bda8f2eb1a63d2b7152418",
+    },
+)
 
 
-def test_get_nodes_by_attributes_endpoint(mock_db_find_by_attributes,
-                                          test_client):
-    """
-    Test Case : Test KernelCI API GET /nodes?attribute_name=attribute_value
-    endpoint for the positive path
-    Expected Result :
-        HTTP Response Code 200 OK
-        List with matching Node objects
-    """
-    node_obj_1 = {
+CHECKOUT_NODES = (
+    {
+        **NODE_TEMPLATE,
         "id": "61bda8f2eb1a63d2b7152418",
-        "kind": "checkout",
         "name": "checkout",
         "path": ["checkout"],
         "data": {
             "kernel_revision": {
-                "tree": "mainline",
-                "url": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
-                "branch": "master",
+                **MAINLINE_REVISION,
                 "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
-                "describe": "v5.16-rc4-31-g2a987e65025e",
             },
         },
         "parent": "61bda8f2eb1a63d2b7152410",
-        "state": "closing",
-        "result": None,
         "treeid": "61bda8f2eb1a63d2b7152418",
-    }
-    node_obj_2 = {
+    },
+    {
+        **NODE_TEMPLATE,
         "id": "61bda8f2eb1a63d2b7152414",
-        "kind": "checkout",
         "name": "checkout",
         "path": ["checkout"],
         "data": {
             "kernel_revision": {
-                "tree": "mainline",
-                "url": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
-                "branch": "master",
+                **MAINLINE_REVISION,
                 "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb45",
-                "describe": "v5.16-rc4-31-g2a987e65025e",
             },
         },
         "parent": "61bda8f2eb1a63d2b7152410",
-        "state": "closing",
-        "result": None,
         "treeid": "61bda8f2eb1a63d2b7152414",
-    }
-    mock_db_find_by_attributes.return_value = PageModel(
-        items=[node_obj_1, node_obj_2],
-        total=2,
-        limit=50,
-        offset=0
-    )
-
-    params = {
-        "name": "checkout",
-        "data.kernel_revision.tree": "mainline",
-        "data.kernel_revision.branch": "master",
-        "state": "closing",
-        "parent": "61bda8f2eb1a63d2b7152410",
-        "treeid": "61bda8f2eb1a63d2b7152418",
-    }
-    response = test_client.get(
-        "nodes",
-        params=params,
-        )
-    print("response.json()", response.json())
-    assert response.status_code == 200
-    assert len(response.json()['items']) > 0
+    },
+)
 
 
-def test_get_nodes_by_attributes_endpoint_node_not_found(
-        mock_db_find_by_attributes,
-        test_client):
+def test_create_node_endpoint(mock_db_create, mock_publish_cloudevent,
+                              test_client, sample_node_factory):
     """
-    Test Case : Test KernelCI API GET /nodes?attribute_name=attribute_value
-    endpoint for the node not found
+    Test Case : Test KernelCI API /node endpoint
     Expected Result :
         HTTP Response Code 200 OK
-        Empty list
+        JSON with created Node object attributes
     """
+    revision_data = {
+        **MAINLINE_REVISION,
+        "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
+    }
+    node_obj = sample_node_factory(group="debug")
+    mock_db_create.return_value = node_obj
 
-    mock_db_find_by_attributes.return_value = PageModel(
-        items=[],
-        total=0,
-        limit=50,
-        offset=0
-    )
-
-    params = {
+    request_dict = {
         "name": "checkout",
-        "revision.tree": "baseline"
+        "kind": "checkout",
+        "path": ["checkout"],
+        "data": {"kernel_revision": revision_data},
+        "treeid": "61bda8f2eb1a63d2b7152418",
     }
-    response = test_client.get(
-        "nodes",
-        params=params
+    response = test_client.post(
+        "node",
+        headers=JSON_AUTH_HEADERS,
+        content=orjson.dumps(request_dict),
         )
-    print("response.json()", response.json())
     assert response.status_code == 200
-    assert response.json().get('total') == 0
+    body = response.json()
+    assert body.keys() == EXPECTED_NODE_KEYS
 
 
 def test_get_node_by_id_endpoint(mock_db_find_by_id,
-                                 test_client):
+                                 test_client, sample_node_factory):
     """
     Test Case : Test KernelCI API GET /node/{node_id} endpoint
     for the positive path
@@ -201,53 +182,39 @@ def test_get_node_by_id_endpoint(mock_db_find_by_id,
         HTTP Response Code 200 OK
         JSON with Node object attributes
     """
-    revision_obj = Revision(
-        tree="mainline",
-        url="https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
-        branch="master",
-        commit="2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
-        describe="v5.16-rc4-31-g2a987e65025e"
-    )
-    node_obj = Node(
-        id="61bda8f2eb1a63d2b7152418",
-        kind="checkout",
-        name="checkout",
-        path=["checkout"],
+    node_obj = sample_node_factory(
         group="blah",
-        data = {'kernel_revision': revision_obj},
-        parent=None,
-        state="closing",
-        result=None,
         treeid="61bdaa8f2eb1a63d2b7152418",
     )
     mock_db_find_by_id.return_value = node_obj
 
     response = test_client.get("node/61bda8f2eb1a63d2b7152418")
-    print("response.json()", response.json())
     assert response.status_code == 200
-    assert response.json().keys() == {
-        'id',
-        'artifacts',
-        'created',
-        'data',
-        'debug',
-        'group',
-        'jobfilter',
-        'platform_filter',
-        'holdoff',
-        'kind',
-        'name',
-        'owner',
-        'path',
-        'parent',
-        'result',
-        'submitter',
-        'state',
-        'timeout',
-        'treeid',
-        'updated',
-        'user_groups',
-    }
+    body = response.json()
+    assert body.keys() == EXPECTED_NODE_KEYS
+
+
+@pytest.mark.parametrize('value,expected', [
+    (2**64, 2**64),
+    (float('nan'), None),
+], ids=['large-int', 'nan'])
+def test_get_node_by_id_endpoint_data_values(mock_db_find_by_id, test_client,
+                                             sample_node_factory, value,
+                                             expected):
+    """
+    Test Case : Test KernelCI API GET /node/{node_id} endpoint with node
+    data values orjson can't render as is
+    Expected Result :
+        HTTP Response Code 200 OK
+        Integers beyond 64 bits rendered as they are and NaN as null
+    """
+    mock_db_find_by_id.return_value = sample_node_factory(
+        data={'value': value},
+    )
+
+    response = test_client.get("node/61bda8f2eb1a63d2b7152418")
+    assert response.status_code == 200
+    assert response.json()['data'] == {'value': expected}
 
 
 def test_get_node_by_id_endpoint_empty_response(mock_db_find_by_id,
@@ -262,115 +229,53 @@ def test_get_node_by_id_endpoint_empty_response(mock_db_find_by_id,
     mock_db_find_by_id.return_value = None
 
     response = test_client.get("node/61bda8f2eb1a63d2b7152419")
-    print("response.json()", response.json())
     assert response.status_code == 200
-    assert response.json() is None
+    assert response.content == b"null"
 
 
-def test_get_all_nodes(mock_db_find_by_attributes,
-                       test_client):
-    """
-    Test Case : Test KernelCI API GET /nodes endpoint for the
-    positive path
-    Expected Result :
-        HTTP Response Code 200 OK
-        List of all the node objects.
-    """
-    node_obj_1 = {
-        "id": "61bda8f2eb1a63d2b7152418",
-        "kind": "checkout",
+@pytest.mark.parametrize('params,items', [
+    ({
         "name": "checkout",
-        "path": ["checkout"],
-        "data": {
-            "kernel_revision": {
-                "tree": "mainline",
-                "url": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
-                "branch": "master",
-                "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
-                "describe": "v5.16-rc4-31-g2a987e65025e",
-                "version": None,
-            },
-        },
-        "parent": None,
-        "state": "closing",
-        "result": None,
-        "treeid": "61bda8f2eb1a63d2b7152418",
-    }
-
-    node_obj_2 = {
-        "id": "61bda8f2eb1a63d2b7152414",
-        "kind": "checkout",
-        "name": "test_node",
-        "path": ["checkout", "test_suite", "test_node"],
-        "group": None,
-        "data": {
-            "kernel_revision": {
-                "tree": "mainline",
-                "url": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
-                "branch": "master",
-                "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb45",
-                "describe": "v5.16-rc4-31-g2a987e65025e",
-                "version": None,
-            },
-        },
-        "parent": None,
-        "state": "closing",
-        "result": None,
-        "treeid": "61bda8f2eb1a63d2b7152418",
-    }
-
-    node_obj_3 = {
-        "id": "61bda8f2eb1a63d2b7152421",
-        "kind": "checkout",
-        "name": "test",
-        "path": ["checkout", "group", "test"],
-        "group": None,
-        "data": {
-            "kernel_revision": {
-                "tree": "baseline",
-                "url": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
-                "branch": "master",
-                "commit": "2a987e65025e2b79c6d453b78cb5985ac6e5eb26",
-                "describe": "v5.16-rc4-31-g2a987e65025e",
-                "version": None,
-            },
-        },
-        "parent": None,
+        "data.kernel_revision.tree": "mainline",
+        "data.kernel_revision.branch": "master",
         "state": "closing",
-        "result": None,
+        "parent": "61bda8f2eb1a63d2b7152410",
         "treeid": "61bda8f2eb1a63d2b7152418",
-    }
-
-    mock_db_find_by_attributes.return_value = PageModel(
-        items=[node_obj_1, node_obj_2, node_obj_3],
-        total=3,
-        limit=50,
-        offset=0
-    )
-
-    response = test_client.get("nodes")
-    print("response.json()", response.json())
-    assert response.status_code == 200
-    assert len(response.json()) > 0
-
-
-def test_get_all_nodes_empty_response(mock_db_find_by_attributes,
-                                      test_client):
+    }, CHECKOUT_NODES),
+    ({
+        "name": "checkout",
+        "revision.tree": "baseline",
+    }, ()),
+    ({}, ALL_NODES),
+    ({}, ()),
+], ids=[
+    'by_attributes',
+    'by_attributes_node_not_found',
+    'all_nodes',
+    'all_nodes_empty_response',
+])
+def test_get_nodes_endpoint(mock_db_find_by_attributes, test_client,
+                            params, items):
     """
-    Test Case : Test KernelCI API GET /nodes endpoint for the
-    negative path
+    Test Case : Test KernelCI API GET /nodes endpoint with and without
+    attributes to match, with the database returning matching nodes or an
+    empty page
     Expected Result :
         HTTP Response Code 200 OK
-        Empty list as no Node object is added.
+        Paginated list with all the node objects returned by the database
     """
-    mock_db_find_by_attributes.return_value = PageModel(
-        items=[],
-        total=0,
+    mock_db_find_by_attributes.return_value = PageModel.model_construct(
+        items=list(items),
+        total=len(items),
         limit=50,
         offset=0
     )
 
-    response = test_client.get("nodes")
-    print("response.json()", response.json())
+    response = test_client.get(
+        "nodes",
+        params=params,
+        )
     assert response.status_code == 200
-    assert response.json().get('total') == 0
+    body = response.json()
+    assert body['total'] == len(items)
+    assert len(body['items']) == len(items)
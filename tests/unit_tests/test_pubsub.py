@@ -12,7 +12,6 @@ import json
 import pytest
 
 
-@pytest.mark.asyncio
 async def test_subscribe_single_channel(mock_pubsub):
     """
     Test Case: Subscribe for one channel with a PubSub.subscribe() method.
@@ -30,7 +29,6 @@ async def test_subscribe_single_channel(mock_pubsub):
     assert 1 in mock_pubsub._subscriptions
 
 
-@pytest.mark.asyncio
 async def test_subscribe_multiple_channels(mock_pubsub):
     """
     Test Case: Subscribe for three channels with subsequent calls of
@@ -44,8 +42,6 @@ async def test_subscribe_multiple_channels(mock_pubsub):
         PubSub._subscriptions dict should have 2 entries. This entries'
         keys should be 1, 2, and 3.
     """
-    # Reset `ID_KEY` value to get subscription ID starting from 1
-    await mock_pubsub._redis.set(mock_pubsub.ID_KEY, 0)
     channels = ((1, 'CHANNEL1'), (2, 'CHANNEL2'), (3, 'CHANNEL3'))
     for expected_id, expected_channel in channels:
         result = await mock_pubsub.subscribe(expected_channel, 'test')
@@ -55,7 +51,6 @@ async def test_subscribe_multiple_channels(mock_pubsub):
     assert (1, 2, 3) == tuple(mock_pubsub._subscriptions.keys())
 
 
-@pytest.mark.asyncio
 async def test_unsubscribe_sub_id_exists(mock_pubsub_subscriptions):
     """
     Test Case: Unsubscribe with a PubSub.unsubscribe() method when
@@ -69,7 +64,6 @@ async def test_unsubscribe_sub_id_exists(mock_pubsub_subscriptions):
     assert len(mock_pubsub_subscriptions._subscriptions) == 0
 
 
-@pytest.mark.asyncio
 async def test_unsubscribe_sub_id_not_exists(mock_pubsub_subscriptions):
     """
     Test Case: Unsubscribe with a PubSub.unsubscribe() method when
@@ -86,7 +80,6 @@ async def test_unsubscribe_sub_id_not_exists(mock_pubsub_subscriptions):
     assert 1 in mock_pubsub_subscriptions._subscriptions
 
 
-@pytest.mark.asyncio
 async def test_pubsub_publish_couldevent(mock_pubsub_publish):
     """
     Test Case: Validate and check the json built by the cloud event
@@ -105,12 +98,6 @@ async def test_pubsub_publish_couldevent(mock_pubsub_publish):
 
     await mock_pubsub_publish.publish_cloudevent('CHANNEL1', data, attributes)
 
-    expected_json = str.encode('{"specversion": "1.0", '\
-    '"id": "6878b661-96dc-4e93-8c92-26eb9ff8db64", "source": "https://api.kernelci.org/", '\
-    '"type": "api.kernelci.org", "time": "2022-01-31T21:29:29.675593+00:00", '\
-    '"data": "validate json"}')
-
     json_arg = mock_pubsub_publish._redis.execute_command.call_args.args[2]
 
-    json.loads(json_arg)
-    assert json_arg == expected_json
+    assert json.loads(json_arg) == {**attributes, "data": data}
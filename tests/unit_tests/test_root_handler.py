@@ -7,14 +7,21 @@
 
 """Unit test function for KernelCI API root handler"""
 
+import pytest
 
-def test_root_endpoint(test_client):
+
+@pytest.mark.parametrize('url', [
+    '/',
+    'http://testserver/v0/',
+], ids=['latest', 'v0'])
+def test_root_endpoint(test_client, url):
     """
-    Test Case : Test KernelCI API root endpoint
+    Test Case : Test KernelCI API root endpoint for the latest and the
+    versioned API paths
     Expected Result :
         HTTP Response Code 200 OK
         JSON with 'message' key
     """
-    response = test_client.get("/")
+    response = test_client.get(url)
     assert response.status_code == 200
     assert response.json() == {"message": "KernelCI API"}
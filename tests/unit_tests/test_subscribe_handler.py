@@ -7,7 +7,7 @@
 
 """Unit test function for KernelCI API subscribe handler"""
 
-from tests.unit_tests.conftest import BEARER_TOKEN
+from tests.unit_tests.conftest import AUTH_HEADERS
 from api.pubsub import Subscription
 
 
@@ -23,13 +23,11 @@ def test_subscribe_endpoint(mock_subscribe, test_client):
 
     response = test_client.post(
         "subscribe/abc",
-        headers={
-            "Authorization": BEARER_TOKEN
-        },
+        headers=AUTH_HEADERS,
     )
-    print("response.json()", response.json())
     assert response.status_code == 200
+    body = response.json()
     # verify that id, channel, user are mandatory keys in the response
-    assert "id" in response.json()
-    assert "channel" in response.json()
-    assert "user" in response.json()
+    assert "id" in body
+    assert "channel" in body
+    assert "user" in body
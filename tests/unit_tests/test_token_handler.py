@@ -11,10 +11,22 @@
 """Unit test function for KernelCI API token handler"""
 
 import pytest
-from api.models import User
+from tests.unit_tests.conftest import USER_BOB
+
+
+FORM_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/x-www-form-urlencoded"
+}
+
+LOGIN_BODY = b"username=bob&password=hello"
+
+BAD_LOGIN_BODY = b"username=bob&password=hello1"
+
+# Keep the login tests on one worker when running with pytest-xdist
+pytestmark = pytest.mark.xdist_group(name="token")
 
 
-@pytest.mark.asyncio
 async def test_token_endpoint(test_async_client, mock_user_find,
                               mock_beanie_user_update):
     """
@@ -23,33 +35,18 @@ async def test_token_endpoint(test_async_client, mock_user_find,
         HTTP Response Code 200 OK
         JSON with 'access_token' and 'token_type' key
     """
-    user = User(
-        id='65265305c74695807499037f',
-        username='bob',
-        hashed_password='$2b$12$CpJZx5ooxM11bCFXT76/z.o6HWs2sPJy4iP8.'
-                        'xCZGmM8jWXUXJZ4K',
-        email='bob@kernelci.org',
-        groups=[],
-        is_active=True,
-        is_superuser=False,
-        is_verified=True
-    )
-    mock_user_find.return_value = user
-    mock_beanie_user_update.return_value = user
+    mock_user_find.return_value = USER_BOB.model_copy(deep=True)
+    mock_beanie_user_update.return_value = USER_BOB.model_copy(deep=True)
 
     response = await test_async_client.post(
         "user/login",
-        headers={
-            "Accept": "application/json",
-            "Content-Type": "application/x-www-form-urlencoded"
-        },
-        data="username=bob&password=hello"
+        headers=FORM_HEADERS,
+        content=LOGIN_BODY
     )
     assert response.status_code == 200
-    assert ('access_token', 'token_type') == tuple(response.json().keys())
+    assert response.json().keys() == {'access_token', 'token_type'}
 
 
-@pytest.mark.asyncio
 async def test_token_endpoint_incorrect_password(test_async_client,
                                                  mock_user_find):
     """
@@ -65,12 +62,8 @@ async def test_token_endpoint_incorrect_password(test_async_client,
     # Pass incorrect password
     response = await test_async_client.post(
         "user/login",
-        headers={
-            "Accept": "application/json",
-            "Content-Type": "application/x-www-form-urlencoded"
-        },
-        data="username=bob&password=hello1"
+        headers=FORM_HEADERS,
+        content=BAD_LOGIN_BODY
     )
-    print("response json", response.json())
     assert response.status_code == 400
     assert response.json() == {'detail': 'LOGIN_BAD_CREDENTIALS'}
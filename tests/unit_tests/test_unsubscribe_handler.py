@@ -7,7 +7,7 @@
 
 """Unit test functions for KernelCI API unsubscribe handler"""
 
-from tests.unit_tests.conftest import BEARER_TOKEN
+from tests.unit_tests.conftest import AUTH_HEADERS
 
 
 def test_unsubscribe_endpoint(mock_unsubscribe, test_client):
@@ -18,9 +18,7 @@ def test_unsubscribe_endpoint(mock_unsubscribe, test_client):
     """
     response = test_client.post(
         "unsubscribe/1",
-        headers={
-            "Authorization": BEARER_TOKEN
-        },
+        headers=AUTH_HEADERS,
     )
     assert response.status_code == 200
 
@@ -34,10 +32,7 @@ def test_unsubscribe_endpoint_empty_response(test_client):
     """
     response = test_client.post(
         "unsubscribe/1",
-        headers={
-            "Authorization": BEARER_TOKEN
-        },
+        headers=AUTH_HEADERS,
     )
-    print("response.json()", response.json())
     assert response.status_code == 404
-    assert 'detail' in response.json()
+    assert b'"detail"' in response.content
@@ -7,15 +7,18 @@
 
 """Unit test functions for KernelCI API user group handler"""
 
-import json
-
 from tests.unit_tests.conftest import (
-    ADMIN_BEARER_TOKEN,
-    BEARER_TOKEN,
+    JSON_ADMIN_HEADERS,
+    JSON_AUTH_HEADERS,
 )
 from api.models import UserGroup, PageModel
 
 
+KERNELCI_GROUP_BODY = b'{"name": "kernelci"}'
+
+KERNELCI_GROUP = UserGroup(id='61bda8f2eb1a63d2b7152422', name='kernelci')
+
+
 def test_create_user_group(mock_db_create, mock_publish_cloudevent,
                            test_client):
     """
@@ -25,25 +28,18 @@ def test_create_user_group(mock_db_create, mock_publish_cloudevent,
         HTTP Response Code 200 OK
         JSON with 'id' and 'name' keys
     """
-    mock_db_create.return_value = UserGroup(
-        id='61bda8f2eb1a63d2b7152422',
-        name='kernelci')
+    mock_db_create.return_value = KERNELCI_GROUP
 
     response = test_client.post(
         "group",
-        headers={
-            "Accept": "application/json",
-            "Authorization": ADMIN_BEARER_TOKEN
-        },
-        data=json.dumps({"name": "kernelci"})
+        headers=JSON_ADMIN_HEADERS,
+        content=KERNELCI_GROUP_BODY
     )
-    print(response.json())
     assert response.status_code == 200
-    assert ('id', 'name') == tuple(response.json().keys())
+    assert response.json().keys() == {'id', 'name'}
 
 
-def test_create_group_endpoint_negative(mock_publish_cloudevent,
-                                        test_client):
+def test_create_group_endpoint_negative(test_client):
     """
     Test Case : Test KernelCI API /group endpoint when requested
     with regular user's bearer token
@@ -53,13 +49,9 @@ def test_create_group_endpoint_negative(mock_publish_cloudevent,
     """
     response = test_client.post(
         "group",
-        headers={
-            "Accept": "application/json",
-            "Authorization": BEARER_TOKEN
-        },
-        data=json.dumps({"name": "kernelci"})
+        headers=JSON_AUTH_HEADERS,
+        content=KERNELCI_GROUP_BODY
     )
-    print(response.json())
     assert response.status_code == 403
     assert response.json() == {'detail': 'Forbidden'}
 
@@ -85,10 +77,8 @@ def test_get_groups(mock_db_find_by_attributes,
         offset=0
     )
     response = test_client.get("groups")
-    print("response.json()", response.json())
     assert response.status_code == 200
-    assert ('items', 'total', 'limit',
-            'offset') == tuple(response.json().keys())
+    assert response.json().keys() == {'items', 'total', 'limit', 'offset'}
 
 
 def test_get_group_by_id(mock_db_find_by_id,
@@ -99,10 +89,8 @@ def test_get_group_by_id(mock_db_find_by_id,
         HTTP Response Code 200 OK
         JSON with UserGroup object
     """
-    mock_db_find_by_id.return_value = UserGroup(id='61bda8f2eb1a63d2b7152422',
-                                                name='kernelci')
+    mock_db_find_by_id.return_value = KERNELCI_GROUP
 
     response = test_client.get("group/61bda8f2eb1a63d2b7152422")
-    print("response.json()", response.json())
     assert response.status_code == 200
     assert response.json().keys() == {'id', 'name'}
@@ -7,170 +7,131 @@
 
 """Unit test function for KernelCI API user handler"""
 
-import json
+import orjson
 import pytest
 
 from tests.unit_tests.conftest import (
-    ADMIN_BEARER_TOKEN,
-    BEARER_TOKEN,
+    ADMIN_HEADERS,
+    JSON_ADMIN_HEADERS,
+    JSON_AUTH_HEADERS,
 )
 from api.models import UserGroup, UserRead
 
 
-@pytest.mark.asyncio
-async def test_create_regular_user(mock_db_find_one, mock_db_create,
-                                   test_async_client):
-    """
-    Test Case : Test KernelCI API /user/register endpoint to create regular
-    user when requested with admin user's bearer token
-    Expected Result :
-        HTTP Response Code 200 OK
-        JSON with 'id', 'username', 'email', 'groups', 'is_active'
-        'is_verified' and 'is_superuser' keys
-    """
-    mock_db_find_one.return_value = None
-    user = UserRead(
-        id='65265305c74695807499037f',
-        username='test',
-        email='test@kernelci.org',
-        groups=[],
-        is_active=True,
-        is_verified=False,
-        is_superuser=False
-    )
-    mock_db_create.return_value = user
+EXPECTED_USER_KEYS = frozenset({
+    'id',
+    'email',
+    'is_active',
+    'is_superuser',
+    'is_verified',
+    'username',
+    'groups',
+})
+
+REGULAR_USER = UserRead(
+    id='61bda8f2eb1a63d2b7152419',
+    username='test',
+    email='test@kernelci.org',
+    groups=[],
+    is_active=True,
+    is_verified=False,
+    is_superuser=False
+)
 
-    response = await test_async_client.post(
-        "user/register",
-        headers={
-            "Accept": "application/json",
-            "Authorization": ADMIN_BEARER_TOKEN
-        },
-        data=json.dumps({
-            'username': 'test',
-            'password': 'test',
-            'email': 'test@kernelci.org'
-        })
-    )
-    print(response.json())
-    assert response.status_code == 200
-    assert ('id', 'email', 'is_active', 'is_superuser', 'is_verified',
-            'username', 'groups') == tuple(response.json().keys())
+ADMIN_USER = UserRead(
+    id='61bda8f2eb1a63d2b7152419',
+    username='test_admin',
+    email='test-admin@kernelci.org',
+    groups=[],
+    is_active=True,
+    is_verified=False,
+    is_superuser=True
+)
+
+GROUP_USER = UserRead(
+    id='61bda8f2eb1a63d2b7152419',
+    username='test',
+    email='test-admin@kernelci.org',
+    groups=[UserGroup(name='kernelci')],
+    is_active=True,
+    is_verified=False,
+    is_superuser=False
+)
+
+USER_BY_ID = UserRead(
+    id='61bda8f2eb1a63d2b7152418',
+    username='test',
+    email='test@kernelci.org',
+    groups=[],
+    is_active=True,
+    is_verified=False,
+    is_superuser=False
+)
 
 
-@pytest.mark.asyncio
-async def test_create_admin_user(test_async_client, mock_db_find_one,
-                                 mock_db_find_by_id, mock_db_update):
+@pytest.mark.parametrize('user', [
+    REGULAR_USER,
+    ADMIN_USER,
+    GROUP_USER,
+], ids=['regular_user', 'admin_user', 'user_with_group'])
+async def test_create_user(request, test_async_client, mock_db_find_one,
+                           user):
     """
-    Test Case : Test KernelCI API /user/register endpoint to create admin user
-    when requested with admin user's bearer token
+    Test Case : Test KernelCI API /user/register endpoint to create a
+    regular user, an admin user and a user with a user group when requested
+    with admin user's bearer token
     Expected Result :
         HTTP Response Code 200 OK
         JSON with 'id', 'username', 'email', 'groups', 'is_active'
         'is_verified' and 'is_superuser' keys
     """
-    user = UserRead(
-        id='61bda8f2eb1a63d2b7152419',
-        username='test_admin',
-        email='test-admin@kernelci.org',
-        groups=[],
-        is_active=True,
-        is_verified=False,
-        is_superuser=True
-    )
-    mock_db_find_one.return_value = None
-    mock_db_find_by_id.return_value = user
-    mock_db_update.return_value = user
+    payload = {
+        'username': user.username,
+        'password': 'test',
+        'email': user.email,
+    }
+    if user.is_superuser:
+        payload['is_superuser'] = True
+    if user.groups:
+        payload['groups'] = [group.name for group in user.groups]
+    # No user with the same username, then the requested groups
+    mock_db_find_one.side_effect = [None, *user.groups]
+    if user.is_superuser:
+        # Admin users are updated after being created, only mock the
+        # database calls used for that when needed
+        request.getfixturevalue('mock_db_find_by_id').return_value = user
+        request.getfixturevalue('mock_db_update').return_value = user
 
     response = await test_async_client.post(
         "user/register",
-        headers={
-            "Accept": "application/json",
-            "Authorization": ADMIN_BEARER_TOKEN
-        },
-        data=json.dumps({
-            'username': 'test_admin',
-            'password': 'test',
-            'email': 'test-admin@kernelci.org',
-            'is_superuser': True
-        })
+        headers=JSON_ADMIN_HEADERS,
+        content=orjson.dumps(payload)
     )
-    print(response.json())
     assert response.status_code == 200
-    assert ('id', 'email', 'is_active', 'is_superuser', 'is_verified',
-            'username', 'groups') == tuple(response.json().keys())
+    assert response.json().keys() == EXPECTED_USER_KEYS
 
 
-@pytest.mark.asyncio
 async def test_create_user_endpoint_negative(test_async_client):
     """
     Test Case : Test KernelCI API /user/register endpoint when requested
     with regular user's bearer token
     Expected Result :
-        HTTP Response Code 401 Unauthorized
+        HTTP Response Code 403 Forbidden
         JSON with 'detail' key denoting 'Forbidden' error
     """
     response = await test_async_client.post(
         "user/register",
-        headers={
-            "Accept": "application/json",
-            "Authorization": BEARER_TOKEN
-        },
-        data=json.dumps({
+        headers=JSON_AUTH_HEADERS,
+        content=orjson.dumps({
             'username': 'test',
             'password': 'test',
             'email': 'test@kernelci.org'
         })
     )
-    print(response.json())
     assert response.status_code == 403
-    assert response.json() == {'detail': 'Forbidden'}
+    assert response.content == b'{"detail":"Forbidden"}'
 
 
-@pytest.mark.asyncio
-async def test_create_user_with_group(test_async_client, mock_db_find_one,
-                                      mock_db_update,mock_db_find_by_id):
-    """
-    Test Case : Test KernelCI API /user/register endpoint to create a user
-    with a user group
-    Expected Result :
-        HTTP Response Code 200 OK
-        JSON with 'id', 'username', 'email', 'groups', 'is_active'
-        'is_verified' and 'is_superuser' keys
-    """
-    user = UserRead(
-        id='61bda8f2eb1a63d2b7152419',
-        username='test_admin',
-        email='test-admin@kernelci.org',
-        groups=[UserGroup(name='kernelci')],
-        is_active=True,
-        is_verified=False,
-        is_superuser=False
-    )
-    mock_db_find_by_id.return_value = user
-    mock_db_update.return_value = user
-    mock_db_find_one.side_effect = [None, UserGroup(name='kernelci')]
-
-    response = await test_async_client.post(
-        "user/register",
-        headers={
-            "Accept": "application/json",
-            "Authorization": ADMIN_BEARER_TOKEN
-        },
-        data=json.dumps({
-            'username': 'test',
-            'password': 'test',
-            'email': 'test-admin@kernelci.org',
-            'groups': ['kernelci']
-        })
-    )
-    print(response.json())
-    assert response.status_code == 200
-    assert ('id', 'email', 'is_active', 'is_superuser', 'is_verified',
-            'username', 'groups') == tuple(response.json().keys())
-
-
-@pytest.mark.asyncio
 async def test_get_user_by_id_endpoint(test_async_client,
                                        mock_beanie_get_user_by_id):
     """
@@ -180,24 +141,10 @@ async def test_get_user_by_id_endpoint(test_async_client,
         HTTP Response Code 200 OK
         JSON with User object attributes
     """
-    user_obj = UserRead(
-            id='61bda8f2eb1a63d2b7152418',
-            username='test',
-            email='test@kernelci.org',
-            groups=[],
-            is_active=True,
-            is_verified=False,
-            is_superuser=False
-        )
-    mock_beanie_get_user_by_id.return_value = user_obj
+    mock_beanie_get_user_by_id.return_value = USER_BY_ID
 
     response = await test_async_client.get(
         "user/61bda8f2eb1a63d2b7152418",
-        headers={
-            "Accept": "application/json",
-            "Authorization": ADMIN_BEARER_TOKEN
-        })
-    print("response.json()", response.json())
+        headers=ADMIN_HEADERS)
     assert response.status_code == 200
-    assert ('id', 'email', 'is_active', 'is_superuser', 'is_verified',
-            'username', 'groups') == tuple(response.json().keys())
+    assert response.json().keys() == EXPECTED_USER_KEYS
@@ -10,39 +10,35 @@
 
 """Unit test function for KernelCI API whoami handler"""
 
-import pytest
-from tests.unit_tests.conftest import BEARER_TOKEN
+import orjson
+from beanie import PydanticObjectId
+from tests.unit_tests.conftest import AUTH_HEADERS, BEARER_TOKEN
 from api.models import UserRead
 
 
-@pytest.mark.asyncio
-async def test_whoami_endpoint(test_async_client, mock_auth_current_user):
+TEST_USER = UserRead.model_construct(
+    id=PydanticObjectId('61bda8f2eb1a63d2b7152420'),
+    username='test-user',
+    email='test-user@kernelci.org',
+    groups=[],
+    is_active=True, is_verified=False, is_superuser=False
+)
+
+
+def test_whoami_endpoint(test_client, mock_auth_current_user):
     """
     Test Case : Test KernelCI API /whoami endpoint
     Expected Result :
         HTTP Response Code 200 OK
-        JSON with 'id', 'username', 'hashed_password'
-        and 'active' keys
+        JSON with 'id', 'username', 'email', 'groups', 'is_active',
+        'is_verified' and 'is_superuser' keys
     """
-    user = UserRead(
-            id='61bda8f2eb1a63d2b7152420',
-            username='test-user',
-            email='test-user@kernelci.org',
-            groups=[],
-            is_active=True,
-            is_verified=False,
-            is_superuser=False
-        )
-    mock_auth_current_user.return_value = user, BEARER_TOKEN
-    response = await test_async_client.get(
+    mock_auth_current_user.return_value = TEST_USER, BEARER_TOKEN
+    response = test_client.get(
         "whoami",
-        headers={
-            "Accept": "application/json",
-            "Authorization": BEARER_TOKEN
-        },
+        headers=AUTH_HEADERS,
     )
-    print(response.json(), response.status_code)
     assert response.status_code == 200
-    assert ('id', 'email', 'is_active', 'is_superuser',
-            'is_verified', 'username',
-            'groups') == tuple(response.json().keys())
+    body = orjson.loads(response.content)
+    assert body.keys() == {'id', 'email', 'is_active', 'is_superuser',
+                           'is_verified', 'username', 'groups'}